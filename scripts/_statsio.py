@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+
+"""
+Shared gem5 results loading for the analysis scripts.
+
+analyze_results.py and plot_results.py used to carry their own copies of the
+stats parser, config extraction and result collection; this module is the
+single home for that layer so parsing improvements land once. Front-ends
+normally only need collect_results().
+"""
+
+import os
+import json
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import NamedTuple
+
+# Compiled once at import time; extract_config_from_path runs once per result
+# directory, so compiling these inside the function would repeat the work
+_CACHE_SIZE_RE = re.compile(r'(\d+)[kK][bB]')
+_ASSOC_RE = re.compile(r'assoc(\d+)')
+_APP_RE = re.compile(r'matrix_mult|image_blur|hash_ops|stream_bench')
+
+# The analysis front-ends only ever read these stats; exact-name membership
+# is cheaper than prefix or regex matching and keeps each parsed result down
+# to a handful of fields instead of the whole stats dump
+_KEY_TO_FIELD = {
+    'sim_seconds': 'sim_seconds',
+    'sim_ticks': 'sim_ticks',
+    'sim_insts': 'sim_insts',
+    'system.cpu.dcache.overall_misses::total': 'l1d_misses',
+    'system.cpu.dcache.overall_accesses::total': 'l1d_accesses',
+    'system.cpu.icache.overall_misses::total': 'l1i_misses',
+    'system.cpu.icache.overall_accesses::total': 'l1i_accesses',
+    'system.l2cache.overall_misses::total': 'l2_misses',
+    'system.l2cache.overall_accesses::total': 'l2_accesses',
+}
+
+# Bytes-keyed view used while scanning, so nothing is decoded on non-matches
+_FIELD_BY_KEY = {key.encode('ascii'): field for key, field in _KEY_TO_FIELD.items()}
+
+@dataclass(slots=True)
+class Stats:
+    """Fixed-schema container for the stats the analysis reads.
+
+    A full stats dump holds thousands of counters, but downstream code only
+    touches these; a flat slotted struct keeps a whole sweep's worth of
+    results small and turns metric reads into attribute lookups."""
+    sim_seconds: float = 0.0
+    sim_ticks: float = 0.0
+    sim_insts: float = 0.0
+    l1d_misses: float = 0.0
+    l1d_accesses: float = 0.0
+    l1i_misses: float = 0.0
+    l1i_accesses: float = 0.0
+    l2_misses: float = 0.0
+    l2_accesses: float = 0.0
+    found: int = 0  # how many of the known stats the file actually contained
+
+    def __bool__(self):
+        return self.found > 0
+
+# One C-level pass over the mapped file pulls out every 'name value' pair;
+# comment and marker lines never match because they don't start with a word
+# character. Only names mapped in _FIELD_BY_KEY are kept.
+_STAT_RE = re.compile(rb'^([\w.:]+)\s+(\S+)', re.MULTILINE)
+
+def parse_stats_file(filepath):
+    """Parse gem5 stats.txt file and extract relevant metrics"""
+    values = {}
+
+    try:
+        with open(filepath, 'rb') as f:
+            # Memory-map the file so pages are faulted in on demand instead
+            # of copying the whole file through a read buffer
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty stats file, nothing to parse
+                return Stats()
+
+            # Hint the sequential scan so the kernel reads ahead aggressively
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+
+            with mm:
+                # gem5 brackets the counters with 'Begin/End Simulation
+                # Statistics' markers; when present, scan just the first
+                # dump section
+                start = 0
+                begin = mm.find(b'Begin Simulation Statistics')
+                if begin != -1:
+                    start = mm.find(b'\n', begin) + 1
+                end = mm.find(b'End Simulation Statistics', start)
+                if end == -1:
+                    end = mm.size()
+
+                # Stop scanning as soon as every known stat has been seen;
+                # the interesting counters sit near the top of the dump
+                needed = len(_FIELD_BY_KEY)
+                for match in _STAT_RE.finditer(mm, start, end):
+                    field = _FIELD_BY_KEY.get(match.group(1))
+                    if field is None:
+                        continue
+
+                    try:
+                        values[field] = float(match.group(2))
+                    except ValueError:
+                        # The known stats are always numeric; skip junk lines
+                        pass
+
+                    if len(values) == needed:
+                        break
+
+    except FileNotFoundError:
+        print(f"Warning: Stats file not found: {filepath}")
+    except OSError as e:
+        print(f"Error parsing {filepath}: {e}")
+
+    return Stats(found=len(values), **values)
+
+class Config(NamedTuple):
+    """Immutable run configuration recovered from a result directory path"""
+    cache_size: str = None
+    cache_size_kb: int = None
+    associativity: int = None
+    application: str = None
+
+@lru_cache(maxsize=None)
+def extract_config_from_path(result_path):
+    """Extract configuration parameters from result path"""
+    cache_size = None
+    cache_size_kb = None
+    associativity = None
+    application = None
+
+    # Try to extract from directory name
+    dirname = os.path.basename(result_path)
+
+    # Look for cache size patterns (e.g., "8kB", "32kB", "128kB")
+    cache_size_match = _CACHE_SIZE_RE.search(dirname)
+    if cache_size_match:
+        cache_size = cache_size_match.group(0)
+        cache_size_kb = int(cache_size_match.group(1))
+
+    # Look for associativity patterns (e.g., "assoc2", "assoc4")
+    assoc_match = _ASSOC_RE.search(dirname)
+    if assoc_match:
+        associativity = int(assoc_match.group(1))
+
+    # Extract application name from path: find a known kernel name anywhere
+    # in the path, then widen the hit to its full directory component
+    app_match = _APP_RE.search(result_path)
+    if app_match:
+        start = result_path.rfind('/', 0, app_match.start()) + 1
+        end = result_path.find('/', app_match.end())
+        application = result_path[start:end if end != -1 else len(result_path)]
+
+    return Config(cache_size, cache_size_kb, associativity, application)
+
+def calculate_ipc(stats):
+    """Calculate IPC from stats"""
+    if stats.sim_ticks > 0:
+        return stats.sim_insts / stats.sim_ticks
+    return 0
+
+# (misses, accesses) field pair per cache level, resolved by one dict
+# lookup instead of an if/elif chain per call
+_MISS_RATE_ATTRS = {
+    'l1d': ('l1d_misses', 'l1d_accesses'),
+    'l1i': ('l1i_misses', 'l1i_accesses'),
+    'l2': ('l2_misses', 'l2_accesses'),
+}
+
+def calculate_miss_rate(stats, cache_type='l1d'):
+    """Calculate cache miss rate"""
+    attrs = _MISS_RATE_ATTRS.get(cache_type)
+    if attrs is None:
+        return 0
+
+    misses = getattr(stats, attrs[0])
+    accesses = getattr(stats, attrs[1])
+    if accesses > 0:
+        return misses / accesses
+    return 0
+
+def get_execution_time(stats):
+    """Get execution time in seconds"""
+    if stats.sim_seconds > 0:
+        return stats.sim_seconds
+    elif stats.sim_ticks > 0:
+        # Assume 1 tick = 0.5 ns (2GHz)
+        return stats.sim_ticks * 0.5e-9
+    return 0
+
+def compute_metrics(stats):
+    """Compute every derived metric for one result's stats.
+
+    Called once per result at collection time so the front-ends index
+    precomputed values instead of re-deriving them."""
+    return {
+        'ipc': calculate_ipc(stats),
+        'l1d_miss_rate': calculate_miss_rate(stats, 'l1d'),
+        'l2_miss_rate': calculate_miss_rate(stats, 'l2'),
+        'execution_time': get_execution_time(stats),
+    }
+
+# Below this many stats files, process-pool startup costs more than it saves
+_PARALLEL_THRESHOLD = 16
+
+# Parsed stats are cached beside the results so that re-running either
+# front-end (or switching metrics) skips re-parsing unchanged files
+_CACHE_FILENAME = '.stats_cache.json'
+
+def _load_stats_cache(results_dir):
+    """Load the parsed-stats cache, or an empty dict if missing/corrupt"""
+    try:
+        with open(os.path.join(results_dir, _CACHE_FILENAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_stats_cache(results_dir, cache):
+    """Write the parsed-stats cache; best-effort, results dir may be read-only"""
+    try:
+        with open(os.path.join(results_dir, _CACHE_FILENAME), 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+def _iter_stats_paths(results_dir):
+    """Yield every stats.txt path under results_dir.
+
+    Iterative scandir walk that stops descending once a directory contains
+    stats.txt — gem5 never nests another run below a run directory — so the
+    walk skips the per-run m5out clutter os.walk would stat and traverse."""
+    stack = [results_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        if any(entry.name == 'stats.txt' for entry in entries):
+            yield os.path.join(directory, 'stats.txt')
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+
+def collect_results(results_dir):
+    """Collect all simulation results from directory structure.
+
+    Each result is a dict with 'path', 'stats' (a Stats), 'config' (a
+    Config) and 'metrics' (the derived values from compute_metrics)."""
+    results = []
+
+    if not os.path.exists(results_dir):
+        print(f"Results directory not found: {results_dir}")
+        return results
+
+    # Walk the tree once, checking each file against the cache as it is
+    # discovered instead of materializing intermediate path lists
+    cache = _load_stats_cache(results_dir)
+    stats_paths = []
+    file_stats = {}
+    parsed = {}
+    to_parse = []
+    for stats_path in _iter_stats_paths(results_dir):
+        stats_paths.append(stats_path)
+        st = os.stat(stats_path)
+        file_stats[stats_path] = st
+
+        entry = cache.get(os.path.relpath(stats_path, results_dir))
+        if entry and entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+            try:
+                parsed[stats_path] = Stats(**entry['stats'])
+            except TypeError:
+                # Index written by an older schema; re-parse this file
+                to_parse.append(stats_path)
+        else:
+            to_parse.append(stats_path)
+
+    # Each stats file parses independently, so fan the parsing out across
+    # cores on large sweeps; small sweeps stay serial
+    if len(to_parse) > _PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as executor:
+            parsed.update(zip(to_parse, executor.map(parse_stats_file, to_parse, chunksize=8)))
+    else:
+        parsed.update((path, parse_stats_file(path)) for path in to_parse)
+
+    new_cache = {}
+    for stats_path in stats_paths:
+        stats = parsed[stats_path]
+        st = file_stats[stats_path]
+        new_cache[os.path.relpath(stats_path, results_dir)] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'stats': asdict(stats)
+        }
+
+        if stats:
+            run_dir = os.path.dirname(stats_path)
+            result = {
+                'path': run_dir,
+                'stats': stats,
+                'config': extract_config_from_path(run_dir),
+                'metrics': compute_metrics(stats)
+            }
+            results.append(result)
+
+    _save_stats_cache(results_dir, new_cache)
+    return results
@@ -1,4 +1,5 @@
 import argparse
+import shutil
 import sys
 import os
 
@@ -7,8 +8,11 @@ from m5.objects import *
 from m5.params import *
 from m5.util import addToPath, fatal
 
-sys.path.append("/opt/ACA2025/gem5/configs")
-addToPath("/opt/ACA2025/gem5/configs")
+# Guarded so drivers that re-import this module in-process don't grow
+# sys.path with duplicate entries on every run
+CONFIGS_PATH = "/opt/ACA2025/gem5/configs"
+if CONFIGS_PATH not in sys.path:
+    addToPath(CONFIGS_PATH)
 
 from common import SimpleOpts
 
@@ -20,8 +24,16 @@ SimpleOpts.add_option("--l1i_assoc", default="2", help="L1 instruction cache ass
 SimpleOpts.add_option("--l2_size", default="256kB", help="L2 cache size")
 SimpleOpts.add_option("--l2_assoc", default="8", help="L2 cache associativity")
 SimpleOpts.add_option("--binary", required=True, help="Binary to run")
+SimpleOpts.add_option("--cpu_type", default="TimingSimpleCPU", help="CPU model to simulate")
 SimpleOpts.add_option("--out_dir", default="m5out", help="Output directory")
 
+# Supported CPU models; an explicit dispatch table avoids eval() on user input
+CPU_TYPES = {
+    "TimingSimpleCPU": TimingSimpleCPU,
+    "AtomicSimpleCPU": AtomicSimpleCPU,
+    "O3CPU": O3CPU,
+}
+
 # Custom cache classes
 class L1Cache(Cache):
     tag_latency = 2
@@ -47,21 +59,21 @@ class L2Cache(Cache):
     mshrs = 20
     tgts_per_mshr = 12
 
-def create_system():
+def create_system(cpu_class=TimingSimpleCPU):
     # Create the system
     system = System()
-    
+
     # Set the clock and voltage
     system.clk_domain = SrcClockDomain()
     system.clk_domain.clock = "2GHz"
     system.clk_domain.voltage_domain = VoltageDomain()
-    
-    # Set up memory mode and ranges
-    system.mem_mode = "timing"
+
+    # Set up memory mode and ranges (atomic CPUs need atomic memory accesses)
+    system.mem_mode = "atomic" if cpu_class is AtomicSimpleCPU else "timing"
     system.mem_ranges = [AddrRange("512MB")]
-    
-    # Create a simple timing CPU
-    system.cpu = TimingSimpleCPU()
+
+    # Create the CPU
+    system.cpu = cpu_class()
     
     # Create L1 caches
     system.cpu.icache = L1ICache()
@@ -107,11 +119,43 @@ def create_system():
     
     return system
 
-def main():
-    args = SimpleOpts.parse_args()
-    
+def save_stats(out_dir):
+    """Copy the simulation's stats.txt into the requested output directory"""
+    src = os.path.join(m5.options.outdir, "stats.txt")
+    dst = os.path.join(out_dir, "stats.txt")
+
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        try:
+            # Zero-copy in-kernel transfer on Linux
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset,
+                                   size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # Fall back to a userspace copy with a 1 MiB buffer
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, length=1 << 20)
+
+    print(f"Stats saved to: {dst}")
+
+def run(args):
+    """Build the system from parsed args and run one simulation"""
+    if args.cpu_type not in CPU_TYPES:
+        fatal(f"Unknown CPU type '{args.cpu_type}'. "
+              f"Choose from: {', '.join(sorted(CPU_TYPES))}")
+
     # Create the system
-    system = create_system()
+    system = create_system(CPU_TYPES[args.cpu_type])
     
     # Configure cache sizes based on command line arguments
     system.cpu.icache.size = args.l1i_size
@@ -140,6 +184,7 @@ def main():
     print(f"  L1D Cache: {args.l1d_size}, {args.l1d_assoc}-way")
     print(f"  L1I Cache: {args.l1i_size}, {args.l1i_assoc}-way") 
     print(f"  L2 Cache: {args.l2_size}, {args.l2_assoc}-way")
+    print(f"  CPU: {args.cpu_type}")
     print(f"  Binary: {args.binary}")
     
     # Run the simulation
@@ -147,5 +192,11 @@ def main():
     
     print(f"Simulation completed: {exit_event.getCause()}")
 
+    # Preserve the stats where the sweep driver expects them
+    save_stats(args.out_dir)
+
+def main():
+    run(SimpleOpts.parse_args())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file